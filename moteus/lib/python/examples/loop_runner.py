@@ -0,0 +1,33 @@
+"""
+Run an example's main() on uvloop when that is installed, and on the
+stock asyncio event loop otherwise.
+
+Usage:
+    from loop_runner import run
+
+    if __name__ == '__main__':
+        run(main())
+"""
+
+import asyncio
+import sys
+
+# uvloop is optional: its libuv based event loop dispatches callbacks
+# in C, which cuts the per-query scheduling overhead at high rates
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+def run(main):
+    """Run the coroutine 'main' to completion, like asyncio.run()."""
+    if uvloop is None:
+        return asyncio.run(main)
+
+    if sys.version_info >= (3, 11):
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            return runner.run(main)
+
+    uvloop.install()
+    return asyncio.run(main)
@@ -2,46 +2,69 @@
 
 import asyncio
 import moteus
+import sys
 from moteus.multiplex import F32
+from loop_runner import run
+
+# ALL possible encoder registers
+REGISTERS = {
+    0x001: F32,  # Motor position
+    0x006: F32,  # Absolute position
+    0x050: F32,  # Encoder 0
+    0x052: F32,  # Encoder 1
+    0x054: F32,  # Encoder 2
+}
 
 async def main():
-    # Query ALL possible encoder registers
     qr = moteus.QueryResolution()
-    qr._extra = {
-        0x001: F32,  # Motor position
-        0x006: F32,  # Absolute position
-        0x050: F32,  # Encoder 0
-        0x052: F32,  # Encoder 1
-        0x054: F32,  # Encoder 2
-    }
+    qr._extra = REGISTERS
     
     controller = moteus.Controller(id=1, query_resolution=qr)
     
     print("Scanning all encoder registers...")
     print("Rotate the motor shaft and see which value changes\n")
+
+    # Sample every 0.5s against absolute deadlines, so query time
+    # doesn't accumulate as drift
+    rate = 0.5
+    loop = asyncio.get_running_loop()
+    next_time = loop.time()
     
     try:
         while True:
             result = await controller.query()
             
-            # Read all encoder registers
-            pos_0x001 = result.values.get(0x001, 0.0)
-            pos_0x006 = result.values.get(0x006, 0.0)
-            pos_0x050 = result.values.get(0x050, 0.0)
-            pos_0x052 = result.values.get(0x052, 0.0)
-            pos_0x054 = result.values.get(0x054, 0.0)
+            # Read all encoder registers, showing 0.0 for any register
+            # missing from the reply
+            values = result.values
+            pos_0x001 = values.get(0x001, 0.0)
+            pos_0x006 = values.get(0x006, 0.0)
+            pos_0x050 = values.get(0x050, 0.0)
+            pos_0x052 = values.get(0x052, 0.0)
+            pos_0x054 = values.get(0x054, 0.0)
             
-            print(f"0x001 (Motor Pos):    {pos_0x001:8.4f} rev")
-            print(f"0x006 (Abs Pos):      {pos_0x006:8.4f} rev")
-            print(f"0x050 (Encoder 0):    {pos_0x050:8.4f} rev")
-            print(f"0x052 (Encoder 1):    {pos_0x052:8.4f} rev")
-            print(f"0x054 (Encoder 2):    {pos_0x054:8.4f} rev")
-            print("-" * 50)
+            # Print them all with a single write
+            sys.stdout.write(
+                f"0x001 (Motor Pos):    {pos_0x001:8.4f} rev\n"
+                f"0x006 (Abs Pos):      {pos_0x006:8.4f} rev\n"
+                f"0x050 (Encoder 0):    {pos_0x050:8.4f} rev\n"
+                f"0x052 (Encoder 1):    {pos_0x052:8.4f} rev\n"
+                f"0x054 (Encoder 2):    {pos_0x054:8.4f} rev\n"
+                f"{'-' * 50}\n")
+            sys.stdout.flush()
             
-            await asyncio.sleep(0.5)
+            next_time += rate
+            delay = next_time - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            elif delay < -rate:
+                # More than a whole period behind, e.g. after stdout or the
+                # transport stalled, so start over from now instead of
+                # sending every missed query back to back
+                next_time = loop.time()
             
     except KeyboardInterrupt:
         print("\nExiting...")
 
 if __name__ == '__main__':
-    asyncio.run(main())
+    run(main())
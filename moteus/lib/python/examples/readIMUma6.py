@@ -34,6 +34,8 @@ Configuration for Onboard Encoder (AUX1 SPI):
 import asyncio
 import math
 import moteus
+import sys
+from loop_runner import run
 
 # Import data type constants
 from moteus.multiplex import INT16, F32
@@ -52,26 +54,26 @@ ACCEL_SCALE = 0.000488 * 9.80665  # m/s² per LSB (at ±16g range)
 # - From datasheet: sensitivity = 70 mdps/LSB = 0.07 deg/s per count
 GYRO_SCALE = 0.07  # degrees/second per LSB (at ±2000 dps range)
 
+# REGISTERS - Custom registers queried every cycle
+# Key = register address (hex), Value = data type
+# Built once at import; the order here is the order values are unpacked
+# in the main loop
+REGISTERS = {
+    # IMU Accelerometer (Type 5 custom firmware)
+    0x072: INT16,  # Accel X - raw int16 value
+    0x073: INT16,  # Accel Y - raw int16 value
+    0x074: INT16,  # Accel Z - raw int16 value
 
-def convert_to_signed(value):
-    """
-    Convert unsigned 16-bit value to signed 16-bit integer.
-    
-    The moteus library returns register values as unsigned integers (0-65535),
-    but sensor data is actually signed (-32768 to +32767).
-    
-    If value > 32767, it's actually a negative number in two's complement format.
-    Example: 64977 (unsigned) = -558 (signed)
-    
-    Args:
-        value: Unsigned integer from register (0-65535)
-    
-    Returns:
-        Signed integer (-32768 to +32767)
-    """
-    if value > 32767:
-        return value - 65536
-    return value
+    # IMU Gyroscope (Type 5 custom firmware)
+    0x080: INT16,  # Gyro X - raw int16 value
+    0x081: INT16,  # Gyro Y - raw int16 value
+    0x082: INT16,  # Gyro Z - raw int16 value
+
+    # Encoders
+    0x001: F32,    # Motor position (MA600 from AUX2 SPI)
+    0x006: F32,    # Absolute position (Onboard AS5047P from AUX1 SPI)
+}
+KEYS = tuple(REGISTERS)
 
 
 async def main():
@@ -91,7 +93,8 @@ async def main():
         '--rate', 
         type=float, 
         default=0.1,
-        help='Update rate in seconds (default: 0.1 = 10 Hz)'
+        help='Update rate in seconds, or 0 to query again as soon as '
+             'each reply arrives (default: 0.1 = 10 Hz)'
     )
     # Add standard moteus transport arguments (--can-iface, --fdcanusb, etc.)
     moteus.make_transport_args(parser)
@@ -102,22 +105,7 @@ async def main():
     qr = moteus.QueryResolution()
     
     # _extra is a dictionary of custom registers to query
-    # Key = register address (hex), Value = data type
-    qr._extra = {
-        # IMU Accelerometer (Type 5 custom firmware)
-        0x072: INT16,  # Accel X - raw int16 value
-        0x073: INT16,  # Accel Y - raw int16 value
-        0x074: INT16,  # Accel Z - raw int16 value
-        
-        # IMU Gyroscope (Type 5 custom firmware)
-        0x080: INT16,  # Gyro X - raw int16 value
-        0x081: INT16,  # Gyro Y - raw int16 value
-        0x082: INT16,  # Gyro Z - raw int16 value
-        
-        # Encoders
-        0x001: F32,    # Motor position (MA600 from AUX2 SPI)
-        0x006: F32,    # Absolute position (Onboard AS5047P from AUX1 SPI)
-    }
+    qr._extra = REGISTERS
 
     # CONTROLLER CONNECTION
     # Get the CAN transport (handles USB adapter, socketcan, etc.)
@@ -132,7 +120,10 @@ async def main():
 
     # DISPLAY STARTUP INFO
     print(f"Reading IMU and encoders from controller {args.target}")
-    print(f"Update rate: {args.rate}s ({1/args.rate:.1f} Hz)")
+    if args.rate:
+        print(f"Update rate: {args.rate}s ({1/args.rate:.1f} Hz)")
+    else:
+        print("Update rate: as fast as replies arrive")
     print()
     print("Sensors:")
     print("  - LSM6DSV16X IMU (6-axis): Accel ±16g, Gyro ±2000 deg/s")
@@ -147,88 +138,106 @@ async def main():
     print("=" * 80)
     print()
 
+    # RAW REPLY DECODING
+    # The first reply is parsed normally and used to find where each of
+    # our registers sits in the reply bytes.  Every later reply has the
+    # same layout, so it is passed through as raw bytes and all eight
+    # values are decoded with a single struct unpack, without building
+    # a dictionary of every register in the reply
+    query = controller.make_query()
+    unpacker = moteus.ReplyUnpacker(
+        (await controller.execute(query)).data, KEYS)
+    query.parse = lambda message: message.data
+
+    # Samples are scheduled against absolute deadlines on the event loop
+    # clock, so the time each query takes doesn't add up into drift
+    loop = asyncio.get_running_loop()
+    next_time = loop.time()
+
+    # LOCAL NAMES - Everything the loop touches is bound to a local
+    # variable once, so each use inside the loop is a fast local lookup
+    # rather than a global or attribute lookup
+    execute = controller.execute
+    unpack = unpacker.unpack
+    accel_scale = ACCEL_SCALE
+    gyro_scale = GYRO_SCALE
+    hypot = math.hypot
+    write = sys.stdout.write
+    flush = sys.stdout.flush
+    now = loop.time
+    sleep = asyncio.sleep
+    rate = args.rate
+
     try:
         # MAIN DATA READING LOOP
         while True:
             # QUERY CONTROLLER - Send CAN request and get response
-            # This sends a CAN frame asking for the registers we specified
-            # The controller responds with the current sensor values
-            result = await controller.query()
-
-            # EXTRACT IMU DATA
-
-            # result.values is a dictionary: {register_address: value}
-            # .get(address, 0) returns the value, or 0 if register not present
-            
-            # Accelerometer raw counts (from registers 0x072-0x074)
-            accel_x_raw = result.values.get(0x072, 0)
-            accel_y_raw = result.values.get(0x073, 0)
-            accel_z_raw = result.values.get(0x074, 0)
-            
-            # Gyroscope raw counts (from registers 0x080-0x082)
-            gyro_x_raw = result.values.get(0x080, 0)
-            gyro_y_raw = result.values.get(0x081, 0)
-            gyro_z_raw = result.values.get(0x082, 0)
-
-            # CONVERT TO SIGNED - Handle negative values correctly
-
-            # The CAN protocol returns unsigned values (0-65535)
-            # But sensor data is signed (-32768 to +32767)
-            # Convert large unsigned values to negative signed values
-            
-            accel_x_raw = convert_to_signed(accel_x_raw)
-            accel_y_raw = convert_to_signed(accel_y_raw)
-            accel_z_raw = convert_to_signed(accel_z_raw)
-            
-            gyro_x_raw = convert_to_signed(gyro_x_raw)
-            gyro_y_raw = convert_to_signed(gyro_y_raw)
-            gyro_z_raw = convert_to_signed(gyro_z_raw)
-
-            # CONVERT TO PHYSICAL UNITS - Apply scale factors
-
-            # Raw counts are meaningless without conversion
-            # Multiply by scale factor to get real-world measurements
-            
+            # This sends a single CAN frame asking for every register we
+            # specified, and the controller answers all of them in one reply
+            data = await execute(query)
+
+            # EXTRACT IMU AND ENCODER DATA
+
+            # Values come back in the order of KEYS:
+            # - Accelerometer raw counts (registers 0x072-0x074)
+            # - Gyroscope raw counts (registers 0x080-0x082)
+            # - MA600 encoder (motor position register 0x001, AUX2 SPI)
+            # - Onboard AS5047P encoder (absolute position register 0x006, AUX1 SPI)
+            (accel_x_raw, accel_y_raw, accel_z_raw,
+             gyro_x_raw, gyro_y_raw, gyro_z_raw,
+             ma600_position_rev, onboard_position_rev) = unpack(data)
+
+            # CONVERT TO PHYSICAL UNITS - The counts are already signed,
+            # since the unpacker decodes INT16 registers as int16
             # Accelerometer: counts → m/s²
-            accel_x = accel_x_raw * ACCEL_SCALE
-            accel_y = accel_y_raw * ACCEL_SCALE
-            accel_z = accel_z_raw * ACCEL_SCALE
+            accel_x = accel_x_raw * accel_scale
+            accel_y = accel_y_raw * accel_scale
+            accel_z = accel_z_raw * accel_scale
 
             # Gyroscope: counts → degrees/second
-            gyro_x = gyro_x_raw * GYRO_SCALE
-            gyro_y = gyro_y_raw * GYRO_SCALE
-            gyro_z = gyro_z_raw * GYRO_SCALE
+            gyro_x = gyro_x_raw * gyro_scale
+            gyro_y = gyro_y_raw * gyro_scale
+            gyro_z = gyro_z_raw * gyro_scale
 
             # CALCULATE MAGNITUDE - Total acceleration vector length
-            # When stationary, this should equal gravity (9.8 m/s²)
-            # Formula: |A| = sqrt(Ax² + Ay² + Az²)
-            accel_mag = math.sqrt(accel_x**2 + accel_y**2 + accel_z**2)
-
-            # MA600 encoder (motor position register 0x001)
-            # Reads from AUX2 SPI (configured as motor_position.sources.0)
-            ma600_position_rev = result.values.get(0x001, 0.0)
-            
-            # Onboard AS5047P encoder (absolute position register 0x006)
-            # Reads from AUX1 SPI (internal motor shaft encoder)
-            onboard_position_rev = result.values.get(0x006, 0.0)
-            
+            # Formula: |A| = sqrt(Ax² + Ay² + Az²), computed with hypot,
+            # which avoids overflow in the squares.  The two argument form
+            # is nested, since it also works on Python 3.7
+            # When stationary, |Accel| should equal gravity (9.8 m/s²)
+            accel_mag = hypot(hypot(accel_x, accel_y), accel_z)
+
             # Convert encoder positions from revolutions to degrees
             ma600_position_deg = ma600_position_rev * 360.0
             onboard_position_deg = onboard_position_rev * 360.0
 
-            print(f"IMU Accelerometer (m/s²): X: {accel_x:7.3f}  Y: {accel_y:7.3f}  Z: {accel_z:7.3f}  |Accel|: {accel_mag:6.3f}")
-            print(f"IMU Gyroscope (deg/s):    X: {gyro_x:7.2f}  Y: {gyro_y:7.2f}  Z: {gyro_z:7.2f}")
-            print(f"MA600 Encoder (deg):      Position: {ma600_position_deg:7.2f}°")
-            print(f"Onboard Encoder (deg):    Position: {onboard_position_deg:7.2f}°")
-            print("=" * 80)
-
-            # Wait before next query (don't spam the controller)
-            await asyncio.sleep(args.rate)
+            # DISPLAY - Build the whole sample and write it out at once,
+            # rather than taking the stdout lock once per line
+            write(
+                f"IMU Accelerometer (m/s²): X: {accel_x:7.3f}  Y: {accel_y:7.3f}  Z: {accel_z:7.3f}  |Accel|: {accel_mag:6.3f}\n"
+                f"IMU Gyroscope (deg/s):    X: {gyro_x:7.2f}  Y: {gyro_y:7.2f}  Z: {gyro_z:7.2f}\n"
+                f"MA600 Encoder (deg):      Position: {ma600_position_deg:7.2f}°\n"
+                f"Onboard Encoder (deg):    Position: {onboard_position_deg:7.2f}°\n"
+                f"{'=' * 80}\n")
+            flush()
+
+            # Wait until the next sample is due (don't spam the controller)
+            # If the query ran late, skip the sleep and catch up.  With
+            # --rate 0 the next query goes out as soon as this one is done
+            if rate:
+                next_time += rate
+                delay = next_time - now()
+                if delay > 0:
+                    await sleep(delay)
+                elif delay < -rate:
+                    # More than a whole period behind, e.g. after stdout or the
+                    # transport stalled, so start over from now instead of
+                    # sending every missed query back to back
+                    next_time = now()
 
     except KeyboardInterrupt:
         print("\nExiting...")
 
 
 if __name__ == '__main__':
-    # Run the async main function
-    asyncio.run(main())
+    # Run the async main function, on uvloop if it is installed
+    run(main())
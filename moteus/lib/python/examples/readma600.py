@@ -8,6 +8,16 @@ connected to the Aux2 port (SPI) of a moteus controller with ID #1.
 import asyncio
 import moteus
 from moteus import multiplex as mp
+from loop_runner import run
+
+# Encoder registers to query
+ENCODER_REGISTERS = {
+    moteus.Register.ENCODER_0_POSITION: mp.F32,  # Raw SPI value
+    moteus.Register.ENCODER_2_POSITION: mp.F32,         #check all three encoders and values
+    moteus.Register.ENCODER_2_VELOCITY: mp.F32,
+}
+
+CAM_ENC_TO_DEG = 360.0  # Deg / Revolution
 
 async def main():
     # Parse command line arguments
@@ -21,30 +31,32 @@ async def main():
     transport = moteus.get_singleton_transport(args)
     controller = moteus.Controller(id=args.target, transport=transport)
 
+    # The custom query frame never changes, so build it once up front
+    query = controller.make_custom_query(ENCODER_REGISTERS)
+
     print(f"Reading MA600 encoder values from Aux2 SPI (controller ID: {args.target}). Press Ctrl+C to exit.")
     print()
 
+    # Sample every 0.1s against absolute deadlines, so query time
+    # doesn't accumulate as drift
+    rate = 0.1
+    loop = asyncio.get_running_loop()
+    next_time = loop.time()
+
     try:
         while True:
             # Query all encoder registers
-            to_query = {
-                moteus.Register.ENCODER_0_POSITION: mp.F32,  # Raw SPI value
-                moteus.Register.ENCODER_2_POSITION: mp.F32,         #check all three encoders and values
-                moteus.Register.ENCODER_2_VELOCITY: mp.F32,
-            }
-
-            # Query using custom_query
-            result = await controller.custom_query(to_query)
-            mc_data = result.values
+            result = await controller.execute(query)
 
-            # Extract values
+            # Extract values, or 0.0 for any register missing from the reply
+            mc_data = result.values
             raw_spi_value = mc_data.get(80, 0.0)  # Register 80 = ENCODER_0_POSITION
             enc2_position = mc_data.get(84, 0.0)  # Register 84 = ENCODER_2_POSITION
             enc2_velocity = mc_data.get(85, 0.0)  # Register 85 = ENCODER_2_VELOCITY
 
-            CAM_ENC_TO_DEG = 360  # Deg / Revolution
-            # Raw SPI value - convert to counts (MA600 is 16-bit)
-            raw_spi_counts = int(raw_spi_value * 65536) if raw_spi_value != 0 else 0
+            # Raw SPI value - convert to counts (MA600 is 16-bit, so a full
+            # revolution wraps back to 0)
+            raw_spi_counts = int(raw_spi_value * 65536.0) & 0xFFFF
             
             encoder_angle_deg = enc2_position * CAM_ENC_TO_DEG
             encoder_velocity_deg_s = enc2_velocity * CAM_ENC_TO_DEG
@@ -56,10 +68,18 @@ async def main():
             print(f"Encoder Velocity (deg/s): {encoder_velocity_deg_s:.2f}°/s")
             print()
 
-            await asyncio.sleep(0.1)
+            next_time += rate
+            delay = next_time - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            elif delay < -rate:
+                # More than a whole period behind, e.g. after stdout or the
+                # transport stalled, so start over from now instead of
+                # sending every missed query back to back
+                next_time = loop.time()
 
     except KeyboardInterrupt:
         print("\nExiting...")
 
 if __name__ == '__main__':
-    asyncio.run(main())
\ No newline at end of file
+    run(main())
\ No newline at end of file
@@ -1,25 +1,25 @@
 #!/usr/bin/python3
-import asyncio
-import moteus
 
-async def main():
-    transport = moteus.get_singleton_transport([])
-    controller = moteus.Controller(id=1, transport=transport)
+"""
+Scan the Aux2 I2C bus of the moteus controller with ID #1 for devices.
 
-    print("Scanning Aux2 I2C addresses...")
-    found = []
-    for addr in range(0x03, 0x78):
-        try:
-            result = await controller.query(aux_i2c=(2, addr, b''))
-            # If no exception, device responded
-            found.append(addr)
-        except Exception:
-            continue
+This is not possible with this version of the library and firmware.
+Controller.query() has no 'aux_i2c' argument, and the firmware does
+not expose raw I2C transactions over CAN; it only polls the devices
+configured in aux2.i2c.devices.X.  Rather than reporting a scan that
+never ran, this example explains that and exits with an error.
+"""
 
-    if found:
-        print(f"Found I2C devices at addresses: {[hex(a) for a in found]}")
-    else:
-        print("No devices detected on Aux2 I2C.")
+import sys
+
+def main():
+    print("Scanning Aux2 I2C addresses is not supported: the moteus\n"
+          "firmware has no raw I2C transactions over CAN, it only polls\n"
+          "the devices configured in aux2.i2c.devices.X.\n"
+          "\n"
+          "To check a device, configure its type and address, then look\n"
+          "at 'tel get aux2' in tview.", file=sys.stderr)
+    return 1
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    sys.exit(main())
@@ -25,7 +25,7 @@ ALL = [
     'TRANSPORT_FACTORIES',
     'INT8', 'INT16', 'INT32', 'F32', 'IGNORE',
     'reader',
-    'RegisterParser', 'QueryParser',
+    'RegisterParser', 'QueryParser', 'ReplyUnpacker',
 ]
 from moteus.command import Command
 from moteus.fdcanusb import Fdcanusb
@@ -38,7 +38,7 @@ from moteus.moteus import (
     make_transport_args, get_singleton_transport,
     TRANSPORT_FACTORIES)
 from moteus.multiplex import (INT8, INT16, INT32, F32, IGNORE,
-                              RegisterParser, QueryParser)
+                              RegisterParser, QueryParser, ReplyUnpacker)
 import moteus.reader as reader
 import moteus.aiostream as aiostream
 
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import math
+import operator
 import struct
 
 """Constants and helper functions used for constructing and parsing
@@ -238,6 +239,72 @@ class RegisterParser:
         return int(self.read(resolution))
 
 
+class ReplyUnpacker:
+    """Extracts a fixed set of register values directly from multiplex
+    response data, without parsing the entire response.
+
+    Every reply to a given query has the same layout, so the location
+    of each register only needs to be found once from a sample reply.
+    After that, each reply is decoded with a single struct unpack.
+    Values are returned raw, without any resolution dependent scaling
+    or NaN handling.
+    """
+
+    def __init__(self, data, registers):
+        """
+        Arguments:
+
+         data: a 'byte' containing a sample multiplex response
+         registers: a sequence of register numbers to extract
+        """
+        parser = RegisterParser(data)
+        fields = {}
+        while True:
+            valid, register, resolution = parser.next()
+            if not valid:
+                break
+            # If a register is present more than once, the last value
+            # wins, the same as when parsing into a dictionary.
+            fields[register] = (parser._offset, resolution)
+            parser.read(resolution)
+
+        missing = [x for x in registers if x not in fields]
+        if missing:
+            raise RuntimeError(
+                "registers not present in reply: " +
+                ", ".join(f"0x{x:03x}" for x in missing))
+
+        in_reply_order = sorted(registers, key=lambda x: fields[x][0])
+        fmt = '<'
+        end = 0
+        for register in in_reply_order:
+            offset, resolution = fields[register]
+            if offset > end:
+                fmt += f'{offset - end}x'
+            fmt += TYPES[resolution].format[-1]
+            end = offset + resolution_size(resolution)
+
+        self.size = len(data)
+        self._struct = struct.Struct(fmt)
+
+        order = [in_reply_order.index(x) for x in registers]
+        self._reorder = None
+        if len(order) > 1 and order != sorted(order):
+            self._reorder = operator.itemgetter(*order)
+
+    def unpack(self, data):
+        """Return a tuple of the register values in 'data', in the order
+        the registers were passed to the constructor."""
+
+        if len(data) != self.size:
+            raise RuntimeError("reply does not match expected layout")
+
+        values = self._struct.unpack_from(data)
+        if self._reorder:
+            return self._reorder(values)
+        return values
+
+
 class QueryParser:
     '''Parse a query to see what fields will be queried and at what
     resolution.'''
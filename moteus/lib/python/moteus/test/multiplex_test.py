@@ -17,6 +17,7 @@
 
 import io
 import math
+import struct
 import unittest
 
 import moteus.multiplex as mp
@@ -65,6 +66,28 @@ class MultiplexTest(unittest.TestCase):
             e([0x24, 0x00, 0x25, 0x05, 0x01, 0x02]),
             [ ( (True, 0x05, mp.INT16), 0x0201) ])
 
+    def test_reply_unpacker(self):
+        def reply(x, y, z):
+            return (bytes([0x22, 0x03, x, 0x15, 0x25, 0x05]) +
+                    struct.pack('<h', y) +
+                    bytes([0x2d, 0x07]) + struct.pack('<f', z) +
+                    bytes([0x50, 0x50]))
+
+        dut = mp.ReplyUnpacker(reply(0x96, 0, 0.0), [0x07, 0x03, 0x05])
+        self.assertEqual(dut.unpack(reply(0x96, 0x0201, 1.5)),
+                         (1.5, -106, 0x0201))
+        self.assertEqual(dut.unpack(reply(0x02, -3, -0.25)),
+                         (-0.25, 2, -3))
+
+        dut = mp.ReplyUnpacker(reply(0x96, 0, 0.0), [0x04, 0x05])
+        self.assertEqual(dut.unpack(reply(0x96, 0x0201, 1.5)),
+                         (21, 0x0201))
+
+        with self.assertRaises(RuntimeError):
+            mp.ReplyUnpacker(reply(0x96, 0, 0.0), [0x06])
+        with self.assertRaises(RuntimeError):
+            dut.unpack(reply(0x96, 0, 0.0)[:-1])
+
     def test_saturate(self):
         self.assertEqual(mp.saturate(-1000.0, mp.INT8, 1.0), -127)
         self.assertEqual(mp.saturate(1000.0, mp.INT8, 1.0), 127)